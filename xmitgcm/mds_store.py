@@ -23,7 +23,8 @@ from .variables import dimensions, \
 # would it be better to import mitgcm_variables and then automate the search
 # for variable dictionaries
 
-from .utils import parse_meta_file, read_mds, parse_available_diagnostics
+from .utils import parse_meta_file, read_mds, parse_available_diagnostics, \
+    get_mds_filenames
 
 # should we hard code this?
 LLC_NUM_FACES = 13
@@ -135,23 +136,30 @@ def open_mdsdataset(data_dir, grid_dir=None,
             else:
                 # We have to check to make sure we have the same prefixes at
                 # each timestep...otherwise we can't combine the datasets.
-                first_prefixes = prefix or _get_all_matching_prefixes(
-                                                        data_dir, iters[0])
+                # Scan the directory once rather than once per iteration.
+                all_prefixes = _get_all_matching_prefixes_by_iternum(
+                                                    data_dir, iters, prefix)
+                first_prefixes = prefix or all_prefixes[int(iters[0])]
                 for iternum in iters:
-                    these_prefixes = _get_all_matching_prefixes(
-                        data_dir, iternum, prefix
-                    )
+                    these_prefixes = all_prefixes[int(iternum)]
                     # don't care about order
                     if set(these_prefixes) != set(first_prefixes):
                         raise IOError("Could not find the expected file "
                                       "prefixes %s at iternum %g. (Instead "
-                                      "found %s)" % (repr(first_prefixes),
-                                                     iternum,
-                                                     repr(these_prefixes)))
+                                      "found %s)" % (
+                                          repr(sorted(first_prefixes)),
+                                          iternum,
+                                          repr(sorted(these_prefixes))))
 
                 # chunk at least by time
                 chunks = chunks or {}
 
+                # infer the model dimensions once here, rather than having
+                # every iteration re-read the grid metadata
+                is_llc = (_check_geometry(geometry) == 'llc')
+                nz, _, ny, nx = _resolve_model_dimensions(
+                    grid_dir or data_dir, is_llc, nx, ny, nz)
+
                 # recursively open each dataset at a time
                 kwargs = dict(
                     grid_dir=grid_dir, delta_t=delta_t, swap_dims=False,
@@ -278,12 +286,7 @@ class _MDSDataStore(xr.backends.common.AbstractDataStore):
             The prefixes of the data files to be read.
         """
 
-        self.geometry = geometry.lower()
-        allowed_geometries = ['cartesian', 'sphericalpolar', 'llc', 'curvilinear']
-        if self.geometry not in allowed_geometries:
-            raise ValueError('Unexpected value for parameter `geometry`. '
-                             'It must be one of the following: %s' %
-                             allowed_geometries)
+        self.geometry = _check_geometry(geometry)
 
         # the directory where the files live
         self.data_dir = data_dir
@@ -311,22 +314,11 @@ class _MDSDataStore(xr.backends.common.AbstractDataStore):
 
         # TODO: and maybe here a check for the presence of layers?
 
-        # we don't need to know ny if using llc
-        if self.llc and (nx is not None):
-            ny = nx
-
         # Now we need to figure out the dimensions of the numerical domain,
         # nx, ny, nz
         # nface is the number of llc faces
-        if (nz is not None) and (ny is not None) and (nz is not None):
-            # we have been passed enough information to determine the
-            # dimensions without reading any files
-            self.nz, self.ny, self.nx = nz, ny, nx
-            self.nface = LLC_NUM_FACES if self.llc else None
-        else:
-            # have to peek at the grid file metadata
-            self.nz, self.nface, self.ny, self.nx = (
-                _guess_model_dimensions(self.grid_dir, self.llc))
+        self.nz, self.nface, self.ny, self.nx = _resolve_model_dimensions(
+            self.grid_dir, self.llc, nx, ny, nz)
         self.layers = _guess_layers(data_dir)
 
         if self.llc:
@@ -491,11 +483,18 @@ class _MDSDataStore(xr.backends.common.AbstractDataStore):
             ddir = self.data_dir
 
         basename = os.path.join(ddir, fname_base)
-        try:
-            vardata = read_mds(basename, iternum, endian=self.endian,
-                               llc=self.llc, llc_method=self.llc_method)
-        except IOError as ioe:
-            # that might have failed because there was no meta file present
+        _, metafile = get_mds_filenames(basename, iternum)
+        # check for the meta file up front so that the common case of it
+        # being missing doesn't need a failed read_mds call
+        have_meta = os.path.exists(metafile)
+        if have_meta:
+            try:
+                vardata = read_mds(basename, iternum, endian=self.endian,
+                                   llc=self.llc, llc_method=self.llc_method)
+            except IOError:
+                # the meta file is there but could not be read
+                have_meta = False
+        if not have_meta:
             # we can try to get around this by specifying the shape and dtype
             try:
                 ndims = len(self._all_data_variables[prefix]['dims'])
@@ -586,8 +585,33 @@ class _MDSDataStore(xr.backends.common.AbstractDataStore):
         return self._dimensions
 
     def close(self):
-        for var in list(self._variables):
-            del self._variables['var']
+        self._variables.clear()
+
+
+def _check_geometry(geometry):
+    """Validate the `geometry` argument and return it in lower case."""
+    geometry = geometry.lower()
+    allowed_geometries = ['cartesian', 'sphericalpolar', 'llc', 'curvilinear']
+    if geometry not in allowed_geometries:
+        raise ValueError('Unexpected value for parameter `geometry`. '
+                         'It must be one of the following: %s' %
+                         allowed_geometries)
+    return geometry
+
+
+def _resolve_model_dimensions(grid_dir, is_llc, nx=None, ny=None, nz=None):
+    """Return (nz, nface, ny, nx), using the given dimensions if they are
+    sufficient and otherwise reading them from the grid metadata."""
+    # we don't need to know ny if using llc
+    if is_llc and (nx is not None):
+        ny = nx
+    if (nx is not None) and (ny is not None) and (nz is not None):
+        # we have been passed enough information to determine the
+        # dimensions without reading any files
+        nface = LLC_NUM_FACES if is_llc else None
+        return nz, nface, ny, nx
+    # have to peek at the grid file metadata
+    return _guess_model_dimensions(grid_dir, is_llc)
 
 
 def _guess_model_dimensions(data_dir, is_llc=False):
@@ -680,16 +704,46 @@ def _recursively_replace(item, search, replace):
         return item
 
 
+# parsed data variable metadata, keyed by diagnostics file and layers, so that
+# opening many iterations from the same directory only parses it once.
+# The cached dicts are shared by every store that uses them and must be treated
+# as read-only. Only the most recently used entries are kept.
+_DATA_VARIABLES_CACHE_SIZE = 8
+_data_variables_cache = xr.core.pycompat.OrderedDict()
+
+
 def _get_all_data_variables(data_dir, layers):
     """"Put all the relevant data metadata into one big dictionary."""
-    allvars = [state_variables]
     # add others from available_diagnostics.log
     fname = os.path.join(data_dir, 'available_diagnostics.log')
     if os.path.exists(fname):
-        diag_file = fname
+        # include mtime and size so we notice if the file changes
+        diag_key = (os.path.abspath(fname), os.path.getmtime(fname),
+                    os.path.getsize(fname))
     else:
         warnings.warn("Couldn't find available_diagnostics.log "
                       "in %s. Using default version." % data_dir)
+        diag_key = None
+    cache_key = (diag_key, tuple(sorted(layers.items())))
+    if cache_key in _data_variables_cache:
+        # re-insert to mark this entry as the most recently used
+        metadata = _data_variables_cache.pop(cache_key)
+    else:
+        metadata = _parse_all_data_variables(fname if diag_key else None,
+                                             layers)
+        while len(_data_variables_cache) >= _DATA_VARIABLES_CACHE_SIZE:
+            _data_variables_cache.popitem(last=False)
+    _data_variables_cache[cache_key] = metadata
+    return metadata
+
+
+def _parse_all_data_variables(fname, layers):
+    """Parse the diagnostics file `fname` (or the default diagnostics if
+    ``None``) and combine it with the state variable metadata."""
+    allvars = [state_variables]
+    if fname is not None:
+        diag_file = fname
+    else:
         from .default_diagnostics import diagnostics
         diag_file = StringIO(diagnostics)
     available_diags = parse_available_diagnostics(diag_file, layers)
@@ -748,18 +802,37 @@ def _get_all_matching_prefixes(data_dir, iternum, file_prefixes=None,
     iteration number."""
     if iternum is None:
         return []
-    prefixes = set()
-    all_datafiles = glob(os.path.join(data_dir, '*.%010d.data' % iternum))
+    return list(_get_all_matching_prefixes_by_iternum(
+        data_dir, [iternum], file_prefixes, ignore_pickup)[int(iternum)])
+
+
+def _get_all_matching_prefixes_by_iternum(data_dir, iternums,
+                                          file_prefixes=None,
+                                          ignore_pickup=True):
+    """Scan a directory once and return a dict mapping each of the iteration
+    numbers in `iternums` to the set of file prefixes matching it."""
+    prefixes = {int(iternum): set() for iternum in iternums}
+    if len(prefixes) == 1:
+        # only look for the files we need
+        pattern = '*.%010d.data' % list(prefixes)[0]
+    else:
+        pattern = '*.??????????.data'
+    all_datafiles = glob(os.path.join(data_dir, pattern))
     for f in all_datafiles:
+        # skip files whose suffix only looks like an iteration number
+        if not f[-15:-5].isdigit():
+            continue
         iternum = int(f[-15:-5])
+        if iternum not in prefixes:
+            continue
         prefix = os.path.split(f[:-16])[-1]
         if file_prefixes is None:
             if not (ignore_pickup and _is_pickup_prefix(prefix)):
-                prefixes.add(prefix)
+                prefixes[iternum].add(prefix)
         else:
             if prefix in file_prefixes:
-                prefixes.add(prefix)
-    return list(prefixes)
+                prefixes[iternum].add(prefix)
+    return prefixes
 
 
 def _iternum_to_datetime_variable(iternum, delta_t, ref_date,
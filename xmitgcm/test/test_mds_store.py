@@ -239,6 +239,27 @@ def test_file_hiding(all_mds_datadirs):
         assert os.path.exists(os.path.join(dirname, basename))
 
 
+def test_partial_model_dimensions(all_mds_datadirs):
+    """Check that nx is inferred when only ny and nz are given, and that
+    giving all of nx, ny, nz avoids reading the grid metadata."""
+    dirname, expected = all_mds_datadirs
+    if expected['geometry'] == 'llc':
+        pytest.skip("llc infers ny from nx")
+
+    nz = expected['shape'][0]
+    ny, nx = expected['shape'][-2:]
+    kwargs = dict(iters=expected['test_iternum'], prefix=['T'],
+                  geometry=expected['geometry'], read_grid=False,
+                  swap_dims=False)
+
+    ds = xmitgcm.open_mdsdataset(dirname, ny=ny, nz=nz, **kwargs)
+    assert ds.dims['i'] == nx
+
+    with hide_file(dirname, 'XC.meta', 'RC.meta'):
+        ds = xmitgcm.open_mdsdataset(dirname, nx=nx, ny=ny, nz=nz, **kwargs)
+        assert ds.dims['i'] == nx
+
+
 def test_read_mds(all_mds_datadirs):
     """Check that we can read mds data from .meta / .data pairs"""
 
@@ -335,6 +356,30 @@ def test_read_raw_data_llc(llc_mds_datadirs, method):
     assert data.shape == shape_2d
     assert data.compute().shape == shape_2d
 
+@pytest.mark.parametrize("memmap", [True, False])
+def test_read_2d_face_llc(llc_mds_datadirs, memmap):
+    """Check that reading a single face matches slicing the full facet."""
+    dirname, expected = llc_mds_datadirs
+
+    from xmitgcm.utils import (_read_2d_face, _read_2d_facet, face_facets,
+                               face_offsets, transpose_face, LLC_NUM_FACES)
+
+    nz, nface, ny, nx = expected['shape']
+    dtype = expected['dtype'].newbyteorder('>')
+    fname = os.path.join(dirname, 'T.%010d.data' % expected['test_iternum'])
+
+    for nlev in [0, nz - 1]:
+        for n in range(LLC_NUM_FACES):
+            facet = _read_2d_facet(fname, face_facets[n], nlev, nx,
+                                   dtype=dtype, memmap=memmap)
+            face_slice = slice(nx*face_offsets[n], nx*(face_offsets[n]+1))
+            expected_face = facet[face_slice]
+            if transpose_face[n]:
+                expected_face = expected_face.T
+            face = _read_2d_face(fname, n, nlev, nx, dtype=dtype,
+                                 memmap=memmap)
+            np.testing.assert_array_equal(face, expected_face)
+
 #########################################################
 ### Below are all tests that actually create datasets ###
 #########################################################
@@ -417,7 +462,7 @@ def test_values_and_endianness(all_mds_datadirs):
             val_le = ds[vname].values.newbyteorder('<')[idx]
             np.testing.assert_allclose(ds_le[vname].values[idx], val_le)
 
-def test_open_dataset_no_meta(all_mds_datadirs):
+def test_open_dataset_no_meta(all_mds_datadirs, monkeypatch):
     """Make sure we read  variables with no .meta files."""
     dirname, expected = all_mds_datadirs
 
@@ -453,6 +498,29 @@ def test_open_dataset_no_meta(all_mds_datadirs):
                                     geometry=expected['geometry'],
                                     read_grid=False)
 
+    # without a meta file, read_mds should only be called once per prefix
+    import xmitgcm.mds_store
+    orig_read_mds = xmitgcm.mds_store.read_mds
+    calls = []
+    def counting_read_mds(fname, *args, **kwargs):
+        calls.append(os.path.basename(fname))
+        return orig_read_mds(fname, *args, **kwargs)
+    monkeypatch.setattr(xmitgcm.mds_store, 'read_mds', counting_read_mds)
+    with hide_file(dirname, *to_hide):
+        ds = xmitgcm.open_mdsdataset(dirname, prefix=['T', 'Eta'], **kwargs)
+    assert sorted(calls) == ['Eta', 'T']
+    monkeypatch.undo()
+
+    # a meta file that exists but can't be read falls back the same way
+    with hide_file(dirname, 'T.%010d.meta' % it):
+        os.mkdir(os.path.join(dirname, 'T.%010d.meta' % it))
+        try:
+            ds = xmitgcm.open_mdsdataset(dirname, prefix=['T'], **kwargs)
+            assert ds['T'].dims == dims_3d
+            assert ds['T'].values.ndim == len(dims_3d)
+        finally:
+            os.rmdir(os.path.join(dirname, 'T.%010d.meta' % it))
+
     # now get rid of the variables used to infer dimensions
     with hide_file(dirname, 'XC.meta', 'RC.meta'):
         with pytest.raises(IOError):
@@ -471,6 +539,22 @@ def test_open_dataset_no_meta(all_mds_datadirs):
                                              nx=nx, ny=ny, nz=nz, **kwargs)
 
 
+def test_close(all_mds_datadirs):
+    """Make sure closing a dataset or its store releases the variables."""
+    from xmitgcm.mds_store import _MDSDataStore
+    dirname, expected = all_mds_datadirs
+
+    ds = xmitgcm.open_mdsdataset(dirname, iters=expected['test_iternum'],
+                                 geometry=expected['geometry'])
+    ds.close()
+
+    store = _MDSDataStore(dirname, iternum=expected['test_iternum'],
+                          geometry=expected['geometry'])
+    assert len(store.get_variables()) > 0
+    store.close()
+    assert len(store.get_variables()) == 0
+
+
 def test_swap_dims(all_mds_datadirs):
     """See if we can swap dimensions."""
 
@@ -580,6 +664,61 @@ def test_multiple_iters(multidim_mds_datadirs):
             geometry=expected['geometry'])
 
 
+def test_multiple_iters_guess_dims_once(multidim_mds_datadirs, monkeypatch):
+    """The model dimensions should only be inferred once for many iters."""
+    import xmitgcm.mds_store
+    dirname, expected = multidim_mds_datadirs
+
+    orig_guess = xmitgcm.mds_store._guess_model_dimensions
+    calls = []
+    def counting_guess(*args, **kwargs):
+        calls.append(args)
+        return orig_guess(*args, **kwargs)
+    monkeypatch.setattr(xmitgcm.mds_store, '_guess_model_dimensions',
+                        counting_guess)
+
+    ds = xmitgcm.open_mdsdataset(
+        dirname, iters=expected['all_iters'], prefix=expected['prefixes'],
+        geometry=expected['geometry'])
+    assert list(ds.iter.values) == expected['all_iters']
+    assert len(calls) == 1
+
+    # an invalid geometry is reported before any metadata is read
+    with pytest.raises(ValueError):
+        xmitgcm.open_mdsdataset(
+            dirname, iters=expected['all_iters'], prefix=expected['prefixes'],
+            geometry='not_a_geometry', swap_dims=False)
+    assert len(calls) == 1
+
+
+def test_prefixes_by_iternum(multidim_mds_datadirs, tmpdir):
+    """Check that a single directory scan matches per-iteration scans."""
+    from xmitgcm.mds_store import (_get_all_matching_prefixes,
+                                   _get_all_matching_prefixes_by_iternum)
+
+    dirname, expected = multidim_mds_datadirs
+    iters = expected['all_iters']
+    by_iternum = _get_all_matching_prefixes_by_iternum(dirname, iters)
+    assert sorted(by_iternum) == iters
+    for iternum in iters:
+        assert by_iternum[iternum] == set(
+            _get_all_matching_prefixes(dirname, iternum))
+
+    by_iternum = _get_all_matching_prefixes_by_iternum(
+        dirname, iters, expected['prefixes'])
+    for iternum in iters:
+        assert by_iternum[iternum] == set(expected['prefixes'])
+
+    # pickup files and files with a non-numeric 10 character field are
+    # ignored; use a separate directory to leave the fixture untouched
+    for basename in ['T.0000000000.data', 'T.0000000010.data',
+                     'pickup.0000000010.data', 'foo.abcdefghij.data']:
+        tmpdir.join(basename).write('')
+    by_iternum = _get_all_matching_prefixes_by_iternum(str(tmpdir), [0, 10])
+    assert by_iternum == {0: set(['T']), 10: set(['T'])}
+    assert _get_all_matching_prefixes(str(tmpdir), 10) == ['T']
+
+
 def test_date_parsing(mds_datadirs_with_refdate):
     """Verify that time information is decoded properly."""
     dirname, expected = mds_datadirs_with_refdate
@@ -618,6 +757,60 @@ def test_parse_diagnostics(all_mds_datadirs):
         assert ad[key] == val
 
 
+def test_data_variables_cache(mds_datadirs_with_diagnostics, tmpdir):
+    """Make sure the diagnostics metadata is only parsed once per file."""
+    from xmitgcm.mds_store import (_get_all_data_variables,
+                                   _data_variables_cache,
+                                   _DATA_VARIABLES_CACHE_SIZE)
+
+    dirname, expected = mds_datadirs_with_diagnostics
+    # work on a copy so the shared fixture directory is left untouched
+    fname = str(tmpdir.join('available_diagnostics.log'))
+    copyfile(os.path.join(dirname, 'available_diagnostics.log'), fname)
+
+    metadata = _get_all_data_variables(str(tmpdir), {})
+    assert _get_all_data_variables(str(tmpdir), {}) is metadata
+
+    # changing the file should invalidate the cache
+    with open(fname, 'a') as f:
+        f.write('\n')
+    assert _get_all_data_variables(str(tmpdir), {}) is not metadata
+    assert len(_data_variables_cache) <= _DATA_VARIABLES_CACHE_SIZE
+
+
+def test_data_variables_cache_eviction(mds_datadirs_with_diagnostics,
+                                       tmpdir, monkeypatch):
+    """Make sure the least recently used metadata is evicted first."""
+    import xmitgcm.mds_store
+    from xmitgcm.mds_store import (_get_all_data_variables,
+                                   _DATA_VARIABLES_CACHE_SIZE)
+
+    # start from an empty cache and restore the original afterwards
+    cache = xr.core.pycompat.OrderedDict()
+    monkeypatch.setattr(xmitgcm.mds_store, '_data_variables_cache', cache)
+
+    dirname, expected = mds_datadirs_with_diagnostics
+    diag_dirs = []
+    for n in range(_DATA_VARIABLES_CACHE_SIZE + 1):
+        diag_dir = tmpdir.mkdir('diags%d' % n)
+        copyfile(os.path.join(dirname, 'available_diagnostics.log'),
+                 str(diag_dir.join('available_diagnostics.log')))
+        diag_dirs.append(str(diag_dir))
+
+    metadata = [_get_all_data_variables(d, {})
+                for d in diag_dirs[:_DATA_VARIABLES_CACHE_SIZE]]
+    assert len(cache) == _DATA_VARIABLES_CACHE_SIZE
+
+    # use the oldest entry again so that the second oldest is evicted
+    assert _get_all_data_variables(diag_dirs[0], {}) is metadata[0]
+    _get_all_data_variables(diag_dirs[-1], {})
+    assert len(cache) == _DATA_VARIABLES_CACHE_SIZE
+    cached = list(cache.values())
+    assert any(m is metadata[0] for m in cached)
+    assert not any(m is metadata[1] for m in cached)
+    assert _get_all_data_variables(diag_dirs[1], {}) is not metadata[1]
+
+
 def test_diagnostics(mds_datadirs_with_diagnostics):
     """Try reading dataset with diagnostics output."""
     dirname, expected = mds_datadirs_with_diagnostics
@@ -70,18 +70,22 @@ def get_useful_info_from_meta_file(metafile):
 
     return nrecs, shape, name, dtype, fldlist
 
-def read_mds(fname, iternum=None, use_mmap=True, force_dict=True, endian='>',
-             shape=None, dtype=None, dask_delayed=True, llc=False,
-             llc_method="smallchunks"):
-    """Read an MITgcm .meta / .data file pair"""
-
+def get_mds_filenames(fname, iternum=None):
+    """Return the paths of the .data and .meta files for the mds file prefix
+    `fname` at iteration number `iternum`."""
     if iternum is None:
         istr = ''
     else:
         assert isinstance(iternum, int)
         istr = '.%010d' % iternum
-    datafile = fname + istr + '.data'
-    metafile = fname + istr + '.meta'
+    return fname + istr + '.data', fname + istr + '.meta'
+
+def read_mds(fname, iternum=None, use_mmap=True, force_dict=True, endian='>',
+             shape=None, dtype=None, dask_delayed=True, llc=False,
+             llc_method="smallchunks"):
+    """Read an MITgcm .meta / .data file pair"""
+
+    datafile, metafile = get_mds_filenames(fname, iternum)
 
     # get metadata
     try:
@@ -289,6 +293,11 @@ def _read_2d_facet(fname, nfacet, nlev, nx, dtype='>f8', memmap=True):
 def _read_2d_face(fname, nface, nlev, nx, dtype='>f8', memmap=True):
     # make sure we have a valid dtype
     nfacet = face_facets[nface]
+    if facet_orders[nfacet] == 'C':
+        # faces are contiguous within C-ordered facets, so we can read just
+        # the one we need rather than the whole facet
+        return _read_2d_contiguous_face(fname, nface, nlev, nx,
+                                        dtype=dtype, memmap=memmap)
     face_slice = slice(nx*face_offsets[nface], nx*(face_offsets[nface]+1))
     facet_offset = nx * face_offsets[nface]
     data_facet = _read_2d_facet(fname, nfacet, nlev, nx,
@@ -298,6 +307,30 @@ def _read_2d_face(fname, nface, nlev, nx, dtype='>f8', memmap=True):
         data = data.T
     return data
 
+def _read_2d_contiguous_face(fname, nface, nlev, nx, dtype='>f8',
+                             memmap=True):
+    # make sure we have a valid dtype
+    dtype = np.dtype(dtype)
+    nbytes = dtype.itemsize
+
+    # where the face starts in the file
+    nfacet = face_facets[nface]
+    face_offset = ((facet_strides[nfacet][0] + face_offsets[nface])
+                   * nx * nx * nbytes)
+    level_offset = LLC_NUM_FACES * nx * nx * nbytes * nlev
+    offset = face_offset + level_offset
+
+    face_shape = (nx, nx)
+    with open(fname, 'rb') as f:
+        if memmap:
+            data = np.memmap(f, dtype=dtype, mode='r', offset=offset,
+                             shape=face_shape)
+        else:
+            f.seek(offset)
+            data = np.fromfile(f, dtype=dtype, count=nx*nx)
+            data = data.reshape(face_shape)
+    return data
+
 # manually construct dask graph
 def read_3d_llc_data(fname, nz, nx, dtype='>f8', memmap=True, nrecs=1,
                      method="smallchunks"):